@@ -0,0 +1,87 @@
+#!/usr/bin/env python3
+"""
+Benchmark the compiled tree-ensemble evaluator against sklearn's predict path.
+
+Fits MISATA's default target model (100-tree GradientBoostingClassifier,
+max_depth=5) on synthetic data, checks that CompiledTreeEnsemble reproduces
+sklearn's predict_proba bit for bit, and reports single-row and bulk latency.
+
+Usage:
+    python benchmarks/compiled_target_model.py
+"""
+
+import sys
+import timeit
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+from sklearn.ensemble import GradientBoostingClassifier, GradientBoostingRegressor
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "src"))
+from misata.compiled_trees import CompiledTreeEnsemble  # noqa: E402
+
+N_TRAIN = 5000
+N_FEATURES = 14
+BULK_SIZES = [100, 256, 512, 1_000, 10_000, 100_000]
+SEED = 42
+
+
+def make_data(n, rng):
+    """Correlated features with a nonlinear binary target."""
+    X = rng.standard_normal((n, N_FEATURES))
+    X[:, 1] += 0.6 * X[:, 0]
+    logits = X[:, 0] - 0.5 * X[:, 1] ** 2 + np.sin(X[:, 2])
+    y = (logits + rng.standard_normal(n) > 0).astype(int)
+    columns = [f"x{i}" for i in range(N_FEATURES)]
+    return pd.DataFrame(X, columns=columns), y
+
+
+def best_time(fn, repeat=5, number=None):
+    """Best per-call time in seconds."""
+    timer = timeit.Timer(fn)
+    if number is None:
+        number, _ = timer.autorange()
+    return min(timer.repeat(repeat=repeat, number=number)) / number
+
+
+def main():
+    rng = np.random.default_rng(SEED)
+    X_train, y_train = make_data(N_TRAIN, rng)
+
+    clf = GradientBoostingClassifier(n_estimators=100, max_depth=5, random_state=SEED)
+    clf.fit(X_train, y_train)
+    reg = GradientBoostingRegressor(n_estimators=100, max_depth=5, random_state=SEED)
+    reg.fit(X_train, y_train + X_train["x3"].values)
+
+    compiled_clf = CompiledTreeEnsemble.from_sklearn(clf)
+    compiled_reg = CompiledTreeEnsemble.from_sklearn(reg)
+
+    # Correctness: bit-identical outputs
+    X_test, _ = make_data(max(BULK_SIZES), rng)
+    assert np.array_equal(clf.predict_proba(X_test), compiled_clf.predict_proba(X_test.values))
+    assert np.array_equal(clf.predict(X_test), compiled_clf.predict(X_test.values))
+    assert np.array_equal(reg.predict(X_test), compiled_reg.predict(X_test.values))
+    print("Outputs are bit-identical to sklearn\n")
+
+    print(f"{'batch':>8} {'sklearn (ms)':>14} {'compiled (ms)':>14} {'speedup':>9}")
+    print("-" * 48)
+
+    # Single-row latency: sklearn on a 1-row DataFrame, as in the intervention paths
+    row_df = X_test.iloc[[0]]
+    row_np = X_test.values[:1]
+    t_sk = best_time(lambda: clf.predict_proba(row_df))
+    t_cp = best_time(lambda: compiled_clf.predict_proba(row_np))
+    print(f"{1:>8} {t_sk * 1e3:>14.3f} {t_cp * 1e3:>14.3f} {t_sk / t_cp:>8.1f}x")
+
+    # Bulk latency, as in sample()
+    for n in BULK_SIZES:
+        batch_df = X_test.iloc[:n]
+        batch_np = X_test.values[:n]
+        t_sk = best_time(lambda: clf.predict_proba(batch_df), repeat=3)
+        t_cp = best_time(lambda: compiled_clf.predict_proba(batch_np), repeat=3)
+        print(f"{n:>8} {t_sk * 1e3:>14.3f} {t_cp * 1e3:>14.3f} {t_sk / t_cp:>8.1f}x")
+
+
+if __name__ == "__main__":
+    main()
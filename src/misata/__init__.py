@@ -8,8 +8,10 @@ __version__ = "0.1.0"
 
 from misata.synthesizers.copula_guided import MISATASynthesizer
 from misata.synthesizers.counterfactual import ConditionalInterventionSynthesizer
+from misata.registry import SynthesizerRegistry
 
 # Backward compatibility alias
 CounterfactualSynthesizer = ConditionalInterventionSynthesizer
 
-__all__ = ["MISATASynthesizer", "ConditionalInterventionSynthesizer", "CounterfactualSynthesizer"]
+__all__ = ["MISATASynthesizer", "ConditionalInterventionSynthesizer", "CounterfactualSynthesizer",
+           "SynthesizerRegistry"]
@@ -0,0 +1,198 @@
+"""Compiled evaluator for fitted gradient-boosted tree ensembles.
+
+Once the copula stage is vectorized, ``target_model.predict_proba`` on the
+100-tree ``GradientBoostingClassifier`` dominates ``sample()`` and the
+intervention paths, and it carries a high per-call overhead on tiny inputs.
+``CompiledTreeEnsemble`` flattens the fitted trees into contiguous NumPy node
+arrays and evaluates all trees at once by batched array traversal, skipping
+sklearn's DataFrame validation. Results are bit-identical to sklearn for the
+finite inputs sklearn accepts; NaN/inf raise ``ValueError`` as in sklearn.
+"""
+
+import numpy as np
+from scipy.special import expit
+from sklearn.dummy import DummyClassifier, DummyRegressor
+from sklearn.ensemble import GradientBoostingClassifier, GradientBoostingRegressor
+from typing import Union
+
+
+class CompiledTreeEnsemble:
+    """
+    Flattened, array-based evaluator for a fitted gradient boosting model.
+
+    All trees are packed into shared node arrays (feature, threshold,
+    left/right child, leaf value). Leaves point to themselves, so every row
+    descends every tree in lockstep for ``depth`` vectorized steps. Large
+    inputs are processed in row chunks of ``chunk_size``.
+
+    The win is per-call overhead: it is several times faster on single rows
+    but only breaks even with sklearn's Cython traversal at roughly 512-1000
+    rows, so callers holding both models should use it only up to
+    ``max_batch_rows`` rows (see ``benchmarks/compiled_target_model.py``).
+
+    To match sklearn bit for bit, inputs are cast to float32 before the
+    split comparisons and leaf contributions are accumulated tree by tree,
+    in the same order as sklearn's ``predict_stages``.
+
+    Supports ``GradientBoostingRegressor`` and binary log-loss
+    ``GradientBoostingClassifier`` with the default (prior or zero) init.
+    """
+
+    chunk_size = 1024
+    max_batch_rows = 512
+
+    def __init__(
+        self,
+        feature: np.ndarray,
+        threshold: np.ndarray,
+        left: np.ndarray,
+        right: np.ndarray,
+        value: np.ndarray,
+        roots: np.ndarray,
+        depth: int,
+        init_raw: float,
+        learning_rate: float,
+        n_features: int,
+        classes: Union[np.ndarray, None] = None
+    ):
+        self.feature = feature
+        self.threshold = threshold
+        self.left = left
+        self.right = right
+        self.children = np.ascontiguousarray(np.column_stack([left, right]).ravel())
+        self.value = value
+        self.roots = roots
+        self.depth = depth
+        self.init_raw = init_raw
+        self.learning_rate = learning_rate
+        self.n_features = n_features
+        self.classes_ = classes
+
+    @classmethod
+    def from_sklearn(
+        cls,
+        model: Union[GradientBoostingClassifier, GradientBoostingRegressor]
+    ) -> 'CompiledTreeEnsemble':
+        """
+        Compile a fitted sklearn gradient boosting model.
+
+        Raises:
+            ValueError: If the model is multiclass, uses a non log-loss
+                classification loss, or a custom init estimator
+        """
+        is_classifier = isinstance(model, GradientBoostingClassifier)
+        if not is_classifier and not isinstance(model, GradientBoostingRegressor):
+            raise ValueError(f"Unsupported model type: {type(model).__name__}")
+        if model.estimators_.shape[1] != 1:
+            raise ValueError("Only binary classification and regression are supported")
+        if is_classifier and model.loss not in ('log_loss', 'deviance'):
+            raise ValueError(f"Unsupported classification loss: {model.loss}")
+        if not (
+            isinstance(model.init_, (DummyClassifier, DummyRegressor))
+            or (isinstance(model.init_, str) and model.init_ == 'zero')
+        ):
+            raise ValueError("Only the default or 'zero' init estimator is supported")
+
+        n_features = model.n_features_in_
+        # The init estimator ignores X, so its raw prediction is a constant
+        init_raw = float(model._raw_predict_init(np.zeros((1, n_features), dtype=np.float32))[0, 0])
+
+        features, thresholds, lefts, rights, values, roots = [], [], [], [], [], []
+        depth = 0
+        offset = 0
+        for estimator in model.estimators_[:, 0]:
+            tree = estimator.tree_
+            n_nodes = tree.node_count
+            node_ids = np.arange(offset, offset + n_nodes, dtype=np.intp)
+            is_leaf = tree.children_left == -1
+
+            # Leaves loop back to themselves so traversal can run a fixed depth
+            features.append(np.where(is_leaf, 0, tree.feature).astype(np.intp))
+            thresholds.append(np.where(is_leaf, 0.0, tree.threshold))
+            lefts.append(np.where(is_leaf, node_ids, tree.children_left + offset).astype(np.intp))
+            rights.append(np.where(is_leaf, node_ids, tree.children_right + offset).astype(np.intp))
+            values.append(tree.value[:, 0, 0])
+            roots.append(offset)
+
+            depth = max(depth, tree.max_depth)
+            offset += n_nodes
+
+        return cls(
+            feature=np.ascontiguousarray(np.concatenate(features)),
+            threshold=np.ascontiguousarray(np.concatenate(thresholds), dtype=np.float64),
+            left=np.ascontiguousarray(np.concatenate(lefts)),
+            right=np.ascontiguousarray(np.concatenate(rights)),
+            value=np.ascontiguousarray(np.concatenate(values), dtype=np.float64),
+            roots=np.asarray(roots, dtype=np.intp),
+            depth=depth,
+            init_raw=init_raw,
+            learning_rate=float(model.learning_rate),
+            n_features=n_features,
+            classes=model.classes_.copy() if is_classifier else None
+        )
+
+    @property
+    def n_trees(self) -> int:
+        return len(self.roots)
+
+    def _leaves(self, X: np.ndarray) -> np.ndarray:
+        """Global leaf index reached in every tree, shape (n_trees, n_samples)."""
+        n_samples = X.shape[0]
+        # Interleaved children: child of node i is children[2 * i + go_right]
+        children = self.children
+        nodes = np.repeat(self.roots[:, None], n_samples, axis=1)
+        row_offsets = np.arange(n_samples, dtype=np.intp) * self.n_features
+        flat_X = X.ravel()
+        for _ in range(self.depth):
+            x = flat_X.take(row_offsets + self.feature.take(nodes))
+            # Negated <= so NaN goes right, as in sklearn
+            go_right = ~(x <= self.threshold.take(nodes))
+            nodes = children.take(2 * nodes + go_right)
+        return nodes
+
+    def _validate(self, X: np.ndarray) -> np.ndarray:
+        X = np.asarray(X)
+        if X.ndim == 1:
+            X = X.reshape(1, -1)
+        if X.shape[1] != self.n_features:
+            raise ValueError(f"X has {X.shape[1]} features, expected {self.n_features}")
+        # sklearn evaluates splits on float32 inputs
+        X = np.ascontiguousarray(X, dtype=np.float32)
+        # sklearn rejects non-finite input (including float32 overflow)
+        if not np.isfinite(X).all():
+            raise ValueError("Input X contains NaN or infinity")
+        return X
+
+    def apply(self, X: np.ndarray) -> np.ndarray:
+        """Return the global leaf index reached in every tree, shape (n_samples, n_trees)."""
+        return self._leaves(self._validate(X)).T
+
+    def decision_function(self, X: np.ndarray) -> np.ndarray:
+        """Raw ensemble output (log-odds for classification), shape (n_samples,)."""
+        X = self._validate(X)
+        raw = np.full(X.shape[0], self.init_raw)
+        # Chunk rows so the per-tree node arrays stay cache resident
+        for start in range(0, X.shape[0], self.chunk_size):
+            stop = start + self.chunk_size
+            contributions = self.learning_rate * self.value.take(self._leaves(X[start:stop]))
+            out = raw[start:stop]
+            # Sequential accumulation keeps the floating-point order of sklearn
+            for tree_contribution in contributions:
+                out += tree_contribution
+        return raw
+
+    def predict_proba(self, X: np.ndarray) -> np.ndarray:
+        """Class probabilities, shape (n_samples, 2)."""
+        if self.classes_ is None:
+            raise AttributeError("predict_proba is only available for classifiers")
+        raw = self.decision_function(X)
+        proba = np.empty((raw.shape[0], 2))
+        proba[:, 1] = expit(raw)
+        proba[:, 0] = 1 - proba[:, 1]
+        return proba
+
+    def predict(self, X: np.ndarray) -> np.ndarray:
+        """Predicted class labels (classifier) or values (regressor)."""
+        if self.classes_ is None:
+            return self.decision_function(X)
+        return self.classes_.take(np.argmax(self.predict_proba(X), axis=1))
@@ -0,0 +1,206 @@
+"""Graph-restricted Gaussian copula for DAG-structured data.
+
+The dense copula estimates and factors a full d x d correlation matrix,
+including noise correlations between variables the domain DAG declares
+conditionally independent. ``GaussianBayesNet`` instead regresses each
+variable's normal score on its DAG parents only:
+
+    z_j = sum_{p in PA(j)} B[j, p] * z_p + sigma_j * eps_j
+
+The implied precision matrix (I - B)^T D^-1 (I - B) is sparse, and sampling
+is a sparse forward substitution in topological order, so both fit and
+sample cost scale with the number of edges rather than d^2.
+"""
+
+import numpy as np
+from scipy import sparse
+from typing import Dict, List, Union
+
+CausalGraph = Union[Dict[str, List[str]], np.ndarray]
+
+
+def parse_graph(graph: CausalGraph, columns: List[str]) -> List[List[int]]:
+    """
+    Convert a causal graph into per-column parent index lists.
+
+    Args:
+        graph: Either a dict mapping node -> list of parents (as used in the
+            experiments), or a boolean d x d mask where ``mask[i, j]`` means
+            column i is a parent of column j. A symmetric (undirected) mask is
+            oriented along column order. Columns absent from a dict are roots.
+        columns: Column order of the data
+
+    Returns:
+        parents[j] = sorted indices of the parents of columns[j]
+    """
+    index = {c: i for i, c in enumerate(columns)}
+    parents: List[List[int]] = [[] for _ in columns]
+
+    if isinstance(graph, dict):
+        for node, node_parents in graph.items():
+            if node not in index:
+                raise ValueError(f"Graph node {node} not in columns")
+            for p in node_parents:
+                if p not in index:
+                    raise ValueError(f"Graph parent {p} of {node} not in columns")
+                if p == node:
+                    raise ValueError(f"Self-loop on {node}")
+                parents[index[node]].append(index[p])
+    else:
+        mask = np.asarray(graph, dtype=bool)
+        if mask.shape != (len(columns), len(columns)):
+            raise ValueError(f"Graph mask must have shape ({len(columns)}, {len(columns)}), "
+                             f"got {mask.shape}")
+        if mask.diagonal().any():
+            raise ValueError("Graph mask has self-loops on the diagonal")
+        if np.array_equal(mask, mask.T):
+            mask = np.triu(mask, k=1)
+        for i, j in zip(*np.nonzero(mask)):
+            parents[j].append(int(i))
+
+    return [sorted(set(p)) for p in parents]
+
+
+def topological_order(parents: List[List[int]]) -> np.ndarray:
+    """Order nodes so every parent precedes its children (Kahn's algorithm)."""
+    n_nodes = len(parents)
+    children: List[List[int]] = [[] for _ in range(n_nodes)]
+    n_parents = np.zeros(n_nodes, dtype=int)
+    for j, node_parents in enumerate(parents):
+        n_parents[j] = len(node_parents)
+        for p in node_parents:
+            children[p].append(j)
+
+    order = []
+    ready = [j for j in range(n_nodes) if n_parents[j] == 0]
+    while ready:
+        node = ready.pop()
+        order.append(node)
+        for child in children[node]:
+            n_parents[child] -= 1
+            if n_parents[child] == 0:
+                ready.append(child)
+
+    if len(order) != n_nodes:
+        raise ValueError("Causal graph contains a cycle")
+    return np.asarray(order, dtype=np.intp)
+
+
+class GaussianBayesNet:
+    """
+    Linear-Gaussian Bayes net over copula normal scores.
+
+    Each variable is regressed on its DAG parents only (standardized scores,
+    least squares), giving sparse coefficients ``B`` and residual standard
+    deviations ``noise_std``.
+
+    The DAG may leave correlated co-parents unconnected, so the empirical
+    fit alone does not give unit model variance. Fit therefore also
+    simulates n scores from the model in topological order, feeding each
+    variable its parents' already-rescaled scores, and rescales each row of
+    ``B`` and its noise scale by the simulated standard deviation, so every
+    sampled score is N(0, 1) up to simulation error and the copula keeps the
+    marginals.
+
+    Fit costs O(n * sum_j (1 + |PA(j)|^2)), i.e. linear in d and the number
+    of edges for bounded in-degree, and sampling O(n * (d + edges)).
+    """
+
+    def __init__(self, parents: List[List[int]]):
+        """
+        Args:
+            parents: parents[j] = indices of the parents of variable j
+        """
+        self.parents = parents
+        self.n_vars = len(parents)
+        self.order = topological_order(parents)
+
+    @classmethod
+    def from_graph(cls, graph: CausalGraph, columns: List[str]) -> 'GaussianBayesNet':
+        """Build from a dict or mask graph (see ``parse_graph``)."""
+        return cls(parse_graph(graph, columns))
+
+    @property
+    def n_edges(self) -> int:
+        return sum(len(p) for p in self.parents)
+
+    def fit(self, normal_scores: np.ndarray, seed: int = 0) -> 'GaussianBayesNet':
+        """
+        Estimate edge coefficients and noise scales.
+
+        Args:
+            normal_scores: (n_samples, n_vars) array of copula normal scores
+            seed: Seed for the simulated scores used to rescale to unit variance
+        """
+        n_samples = normal_scores.shape[0]
+        std = normal_scores.std(axis=0)
+        std[std == 0] = 1.0
+        z = (normal_scores - normal_scores.mean(axis=0)) / std
+
+        node_coef: Dict[int, np.ndarray] = {}
+        noise_var = np.ones(self.n_vars)
+        rng = np.random.default_rng(seed)
+        # Scores simulated from the model fitted so far, variable-major
+        z_model = np.empty((self.n_vars, n_samples))
+
+        for j in self.order:
+            node_parents = self.parents[j]
+            eps = rng.standard_normal(n_samples)
+            if not node_parents:
+                z_model[j] = eps / np.sqrt(np.mean(eps ** 2))
+                continue
+            X = z[:, node_parents]
+            b, *_ = np.linalg.lstsq(X, z[:, j], rcond=None)
+            residual = z[:, j] - X @ b
+            noise_var[j] = max(residual.var(), 1e-6)
+
+            # Parents are already unit variance in the model; estimate z_j's
+            # variance from their simulated scores and rescale so it is too
+            parent_scores = z_model[node_parents].T
+            predicted = parent_scores @ b
+            implied_var = np.mean(predicted ** 2) + noise_var[j]
+            node_coef[j] = b / np.sqrt(implied_var)
+            noise_var[j] /= implied_var
+
+            # Noise orthogonal to the parents' scores, so the simulated z_j has
+            # exactly the model's variance and parent covariances
+            eps -= parent_scores @ np.linalg.lstsq(parent_scores, eps, rcond=None)[0]
+            eps *= np.sqrt(noise_var[j] / np.mean(eps ** 2))
+            z_model[j] = predicted / np.sqrt(implied_var) + eps
+
+        rows = [j for j in node_coef for _ in self.parents[j]]
+        cols = [p for j in node_coef for p in self.parents[j]]
+        coefs = np.concatenate(list(node_coef.values())) if node_coef else []
+        self.coef = sparse.csr_matrix(
+            (coefs, (rows, cols)), shape=(self.n_vars, self.n_vars)
+        )
+        self.noise_std = np.sqrt(noise_var)
+        return self
+
+    @property
+    def precision_matrix(self) -> sparse.csr_matrix:
+        """Sparse precision matrix (I - B)^T D^-1 (I - B)."""
+        i_minus_b = sparse.identity(self.n_vars, format='csr') - self.coef
+        return sparse.csr_matrix(
+            i_minus_b.T @ sparse.diags(1.0 / self.noise_std ** 2) @ i_minus_b
+        )
+
+    def sample_normal(self, noise: np.ndarray) -> np.ndarray:
+        """
+        Map independent standard normal noise to correlated normal scores.
+
+        Solves (I - B) z = D^{1/2} eps by sparse forward substitution: in
+        topological order, (I - B) is unit lower triangular, so each variable
+        only needs its parents' already-computed scores.
+
+        Args:
+            noise: (n_samples, n_vars) standard normal draws
+        """
+        # Variable-major layout keeps each variable's samples contiguous
+        z = (noise * self.noise_std).T.copy()
+        indptr, indices, data = self.coef.indptr, self.coef.indices, self.coef.data
+        for j in self.order:
+            start, stop = indptr[j], indptr[j + 1]
+            if stop > start:
+                z[j] += data[start:stop] @ z[indices[start:stop]]
+        return z.T
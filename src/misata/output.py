@@ -0,0 +1,75 @@
+"""Output containers for synthetic samples.
+
+Synthesizers generate one NumPy array per column. These helpers hand those
+arrays over as a pandas DataFrame, a NumPy structured array or an Arrow
+table without the intermediate DataFrame and column reindex copies.
+"""
+
+import numpy as np
+import pandas as pd
+from typing import Dict, List, Union
+
+OUTPUT_FORMATS = ('pandas', 'numpy', 'arrow')
+
+
+def require_pyarrow():
+    """Import pyarrow, raising a helpful error if it is not installed."""
+    try:
+        import pyarrow
+    except ImportError as e:
+        raise ImportError(
+            "pyarrow is required for Arrow/Parquet output. "
+            "Install it with: pip install pyarrow"
+        ) from e
+    return pyarrow
+
+
+def check_output(output: str) -> None:
+    """Validate an ``output=`` argument."""
+    if output not in OUTPUT_FORMATS:
+        raise ValueError(f"output must be one of {OUTPUT_FORMATS}, got {output!r}")
+
+
+def to_structured(data: Dict[str, np.ndarray], columns: List[str]) -> np.ndarray:
+    """Write columns into one preallocated NumPy structured array."""
+    n_rows = len(data[columns[0]]) if columns else 0
+    out = np.empty(n_rows, dtype=[(c, data[c].dtype) for c in columns])
+    for c in columns:
+        out[c] = data[c]
+    return out
+
+
+def to_arrow(data: Dict[str, np.ndarray], columns: List[str]):
+    """
+    Wrap columns as a ``pyarrow.Table``.
+
+    Contiguous numeric arrays without nulls are wrapped zero-copy, so the
+    table shares memory with the generated columns.
+    """
+    pa = require_pyarrow()
+    return pa.Table.from_arrays(
+        [pa.array(np.ascontiguousarray(data[c])) for c in columns],
+        names=list(columns)
+    )
+
+
+def to_output(
+    data: Dict[str, np.ndarray],
+    columns: List[str],
+    output: str = 'pandas'
+) -> Union[pd.DataFrame, np.ndarray, 'pyarrow.Table']:  # noqa: F821
+    """
+    Convert generated columns into the requested container.
+
+    Args:
+        data: Mapping of column name to generated values
+        columns: Column order of the result
+        output: 'pandas', 'numpy' (structured array) or 'arrow'
+    """
+    check_output(output)
+    if output == 'numpy':
+        return to_structured(data, columns)
+    if output == 'arrow':
+        return to_arrow(data, columns)
+    # Build in final column order rather than reindexing afterwards
+    return pd.DataFrame({c: data[c] for c in columns})
@@ -0,0 +1,332 @@
+"""Memory-budgeted registry of fitted synthesizers.
+
+Serving many fitted synthesizers (e.g. one per customer table) does not fit
+in RAM if every model is kept resident. The registry loads pickled models
+lazily from disk, measures the footprint of each loaded model and evicts the
+least-recently-used ones once a byte budget is exceeded.
+"""
+
+import os
+import pickle
+import sys
+import threading
+import types
+from collections import OrderedDict
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Union
+
+import numpy as np
+import pandas as pd
+
+
+def estimate_nbytes(obj: Any) -> int:
+    """
+    Estimate the resident memory footprint of an object graph in bytes.
+
+    NumPy arrays contribute their data buffers, pandas objects their deep
+    memory usage, and everything else its ``sys.getsizeof``. Containers and
+    instance state are followed recursively; shared objects are counted once.
+    Extension types without a ``__dict__`` (e.g. sklearn's Cython ``Tree``)
+    are followed through ``__getstate__``.
+    """
+    # Maps id -> object so temporaries (e.g. __getstate__ arrays) stay alive
+    # and their ids cannot be reused by later objects during the walk
+    seen = {}
+    buffers = set()
+    total = 0
+    stack = [obj]
+
+    while stack:
+        item = stack.pop()
+        if id(item) in seen:
+            continue
+        seen[id(item)] = item
+
+        if isinstance(item, np.ndarray):
+            # Header, then the data buffer once: views share their base's
+            # buffer, and unpickled arrays wrap a foreign one (memoryview)
+            total += sys.getsizeof(item) - (item.nbytes if item.base is None else 0)
+            root = item
+            while isinstance(root.base, np.ndarray):
+                root = root.base
+            if root.base is None:
+                buffer_key = id(root)
+            else:
+                # A foreign owner (memoryview, sklearn Tree, ...) may expose
+                # several distinct buffers, so key on the buffer itself
+                buffer_key = (id(root.base), root.__array_interface__['data'][0], root.nbytes)
+            if buffer_key not in buffers:
+                buffers.add(buffer_key)
+                total += root.nbytes
+            if item.dtype == object:
+                stack.extend(item.ravel())
+            continue
+        if isinstance(item, (pd.DataFrame, pd.Series, pd.Index)):
+            usage = item.memory_usage(deep=True)
+            total += int(usage.sum()) if hasattr(usage, 'sum') else int(usage)
+            continue
+
+        total += sys.getsizeof(item)
+
+        if isinstance(item, (str, bytes, int, float, complex, bool, type(None), types.ModuleType)):
+            continue
+        if isinstance(item, dict):
+            stack.extend(item.keys())
+            stack.extend(item.values())
+            continue
+        if isinstance(item, (list, tuple, set, frozenset)):
+            stack.extend(item)
+            continue
+
+        state = getattr(item, '__dict__', None)
+        if state is None and not isinstance(item, type):
+            try:
+                state = item.__getstate__()
+            except Exception:
+                state = None
+        if isinstance(state, dict):
+            stack.extend(state.values())
+
+    return total
+
+
+class _Entry:
+    """A resident model and its measured footprint."""
+
+    __slots__ = ('model', 'nbytes')
+
+    def __init__(self, model: Any, nbytes: int):
+        self.model = model
+        self.nbytes = nbytes
+
+
+class _PendingLoad:
+    """A load in progress that concurrent callers can wait on."""
+
+    __slots__ = ('event', 'model', 'error')
+
+    def __init__(self):
+        self.event = threading.Event()
+        self.model = None
+        self.error = None
+
+
+class SynthesizerRegistry:
+    """
+    Lazy-loading, memory-budgeted LRU cache of fitted synthesizers.
+
+    Models are stored as ``<model_dir>/<name>.pkl`` and loaded on first
+    access. After each load the model's footprint is measured with
+    ``estimate_nbytes`` and least-recently-used models are evicted until the
+    resident total fits within ``max_bytes``. A model larger than the whole
+    budget is returned to the caller but not retained, and evicts nothing.
+
+    Thread-safe: concurrent ``get()`` calls for the same model trigger a
+    single load (callers that wait on it are counted as ``coalesced``), and
+    different models load concurrently. ``save()`` invalidates in-flight
+    loads of the same name, so a stale model is never cached.
+
+    ``evictions`` counts only models dropped to stay within the budget;
+    explicit ``evict()``, ``clear()`` and ``save()`` drops are counted as
+    ``invalidations``.
+
+    Example:
+        registry = SynthesizerRegistry('models/', max_bytes=2 * 1024**3)
+        registry.save('customers', synth)
+        synthetic_df = registry.get('customers').sample(n_samples=1000)
+    """
+
+    def __init__(
+        self,
+        model_dir: Union[str, Path],
+        max_bytes: int = 1024 ** 3,
+        loader: Optional[Callable[[Path], Any]] = None,
+        suffix: str = '.pkl'
+    ):
+        """
+        Args:
+            model_dir: Directory holding pickled synthesizers
+            max_bytes: Memory budget for resident models, in bytes
+            loader: Callable mapping a model path to a loaded model
+                (defaults to ``pickle.load``)
+            suffix: File suffix of stored models
+        """
+        if max_bytes <= 0:
+            raise ValueError("max_bytes must be positive")
+
+        self.model_dir = Path(model_dir)
+        self.max_bytes = max_bytes
+        self.loader = loader if loader is not None else self._pickle_load
+        self.suffix = suffix
+
+        self._lock = threading.Lock()
+        self._cache: 'OrderedDict[str, _Entry]' = OrderedDict()
+        self._loading: Dict[str, _PendingLoad] = {}
+        self._generations: Dict[str, int] = {}
+        self._current_bytes = 0
+
+        self.hits = 0
+        self.misses = 0
+        self.coalesced = 0
+        self.evictions = 0
+        self.invalidations = 0
+
+    @staticmethod
+    def _pickle_load(path: Path) -> Any:
+        with open(path, 'rb') as f:
+            return pickle.load(f)
+
+    def path_for(self, name: str) -> Path:
+        """Return the on-disk path of a named model."""
+        return self.model_dir / f"{name}{self.suffix}"
+
+    def save(self, name: str, synthesizer: Any) -> Path:
+        """
+        Pickle a fitted synthesizer into the registry directory.
+
+        Any resident copy under the same name is dropped, and loads already
+        in flight are not cached, so the next ``get()`` sees the new model.
+        """
+        path = self.path_for(name)
+        self.model_dir.mkdir(parents=True, exist_ok=True)
+        # Write then rename, so concurrent loads never read a partial file
+        tmp_path = path.with_name(path.name + '.tmp')
+        with open(tmp_path, 'wb') as f:
+            pickle.dump(synthesizer, f, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(tmp_path, path)
+        with self._lock:
+            self._generations[name] = self._generations.get(name, 0) + 1
+            self._loading.pop(name, None)
+            self._drop(name)
+        return path
+
+    def available(self) -> List[str]:
+        """List names of all models stored on disk."""
+        if not self.model_dir.exists():
+            return []
+        return sorted(p.name[:-len(self.suffix)] for p in self.model_dir.glob(f"*{self.suffix}"))
+
+    def get(self, name: str) -> Any:
+        """
+        Return the named synthesizer, loading it from disk if needed.
+
+        Raises:
+            FileNotFoundError: If no model is stored under ``name``
+        """
+        with self._lock:
+            entry = self._cache.get(name)
+            if entry is not None:
+                self._cache.move_to_end(name)
+                self.hits += 1
+                return entry.model
+
+            pending = self._loading.get(name)
+            is_owner = pending is None
+            if is_owner:
+                pending = _PendingLoad()
+                self._loading[name] = pending
+                generation = self._generations.get(name, 0)
+                self.misses += 1
+            else:
+                # Another thread is already loading this model
+                self.coalesced += 1
+
+        if not is_owner:
+            pending.event.wait()
+            if pending.error is not None:
+                raise pending.error
+            return pending.model
+
+        try:
+            path = self.path_for(name)
+            if not path.exists():
+                raise FileNotFoundError(f"No model named {name!r} at {path}")
+            model = self.loader(path)
+            nbytes = estimate_nbytes(model)
+        except BaseException as exc:
+            with self._lock:
+                if self._loading.get(name) is pending:
+                    del self._loading[name]
+            pending.error = exc
+            pending.event.set()
+            raise
+
+        with self._lock:
+            if self._loading.get(name) is pending:
+                del self._loading[name]
+            # Skip caching if save() replaced the model during the load, or
+            # if the model alone exceeds the budget
+            if self._generations.get(name, 0) == generation and nbytes <= self.max_bytes:
+                self._cache[name] = _Entry(model, nbytes)
+                self._current_bytes += nbytes
+                self._evict_over_budget()
+
+        pending.model = model
+        pending.event.set()
+        return model
+
+    def _evict_over_budget(self) -> None:
+        """Drop least-recently-used models until within budget. Caller holds the lock."""
+        while self._current_bytes > self.max_bytes and self._cache:
+            _, entry = self._cache.popitem(last=False)
+            self._current_bytes -= entry.nbytes
+            self.evictions += 1
+
+    def _drop(self, name: str) -> bool:
+        """Drop a resident model. Caller holds the lock."""
+        entry = self._cache.pop(name, None)
+        if entry is None:
+            return False
+        self._current_bytes -= entry.nbytes
+        self.invalidations += 1
+        return True
+
+    def evict(self, name: str) -> bool:
+        """Drop a resident model. Returns True if it was resident."""
+        with self._lock:
+            return self._drop(name)
+
+    def clear(self) -> None:
+        """Drop all resident models (counters are kept)."""
+        with self._lock:
+            self.invalidations += len(self._cache)
+            self._cache.clear()
+            self._current_bytes = 0
+
+    def nbytes(self, name: str) -> Optional[int]:
+        """Measured footprint of a resident model, or None if not resident."""
+        with self._lock:
+            entry = self._cache.get(name)
+            return entry.nbytes if entry is not None else None
+
+    @property
+    def current_bytes(self) -> int:
+        """Total measured footprint of resident models."""
+        return self._current_bytes
+
+    def resident(self) -> List[str]:
+        """Names of resident models, least recently used first."""
+        with self._lock:
+            return list(self._cache)
+
+    def stats(self) -> Dict[str, int]:
+        """Get hit/miss/coalesced/eviction/invalidation counters and current memory usage."""
+        with self._lock:
+            return {
+                'hits': self.hits,
+                'misses': self.misses,
+                'coalesced': self.coalesced,
+                'evictions': self.evictions,
+                'invalidations': self.invalidations,
+                'resident_models': len(self._cache),
+                'current_bytes': self._current_bytes,
+                'max_bytes': self.max_bytes,
+            }
+
+    def __contains__(self, name: str) -> bool:
+        with self._lock:
+            return name in self._cache
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._cache)
@@ -5,7 +5,11 @@ import pandas as pd
 from scipy import stats
 from sklearn.ensemble import GradientBoostingClassifier, GradientBoostingRegressor
 from sklearn.decomposition import PCA
-from typing import Optional, Dict, List
+from typing import Optional, Dict, List, Union
+
+from misata.compiled_trees import CompiledTreeEnsemble
+from misata.graph_copula import CausalGraph, GaussianBayesNet
+from misata.output import check_output, require_pyarrow, to_arrow, to_output
 
 
 class MISATASynthesizer:
@@ -19,6 +23,7 @@ class MISATASynthesizer:
     - Fast: O(n*d^2) fitting, O(n*d) sampling
     - Causally Valid: Respects DAG structure
     - High-Dimensional: PCA option for 50+ features
+    - Sparse: optional DAG-restricted copula, O(n*edges) fit and sample
     """
     
     def __init__(
@@ -27,7 +32,9 @@ class MISATASynthesizer:
         task: str = 'classification',
         use_pca: bool = False,
         pca_components: float = 0.95,
-        random_state: int = 42
+        random_state: int = 42,
+        compile_target_model: bool = False,
+        causal_graph: Optional[CausalGraph] = None
     ):
         """
         Args:
@@ -36,12 +43,22 @@ class MISATASynthesizer:
             use_pca: Enable PCA for high-dimensional data (50+ features)
             pca_components: Variance to retain (0-1) or n_components (int)
             random_state: Random seed
+            compile_target_model: Flatten the fitted target model into NumPy
+                node arrays for low-overhead, bit-identical prediction on
+                small sample() batches
+            causal_graph: Restrict the copula to a DAG, either {node: [parents]}
+                or a boolean mask (mask[i, j]: column i is a parent of j).
+                Replaces the dense correlation matrix with a sparse Gaussian
+                Bayes net; variables not connected by the graph are independent
         """
         self.target_col = target_col
         self.task = task
         self.use_pca = use_pca
         self.pca_components = pca_components
         self.random_state = random_state
+        self.compile_target_model = compile_target_model
+        self.compiled_target_model = None
+        self.causal_graph = causal_graph
         
         self._fitted = False
         self._intervention = None
@@ -78,29 +95,18 @@ class MISATASynthesizer:
             lambda x: stats.norm.ppf(np.clip(x, 0.001, 0.999))
         )
         
-        # PCA for high-dimensional
-        if self.use_pca:
-            self.pca = PCA(n_components=self.pca_components, random_state=self.random_state)
-            normal_reduced = self.pca.fit_transform(normal_df.values)
-            corr_matrix = np.corrcoef(normal_reduced.T)
-            self.pca_fitted = True
-        else:
-            corr_matrix = normal_df.corr().values
+        # Sparse DAG-restricted copula: no dense correlation or Cholesky
+        if self.causal_graph is not None:
+            if self.use_pca:
+                raise ValueError("causal_graph cannot be combined with use_pca")
+            self.bayes_net = GaussianBayesNet.from_graph(self.causal_graph, self.columns)
+            self.bayes_net.fit(normal_df.values, seed=self.random_state)
             self.pca_fitted = False
-        
-        # Clean correlation matrix
-        corr_matrix = np.nan_to_num(corr_matrix, nan=0.0)
-        np.fill_diagonal(corr_matrix, 1.0)
-        
-        # Ensure positive definite
-        eigvals, eigvecs = np.linalg.eigh(corr_matrix)
-        eigvals = np.maximum(eigvals, 1e-6)
-        corr_matrix = eigvecs @ np.diag(eigvals) @ eigvecs.T
-        corr_matrix = (corr_matrix + corr_matrix.T) / 2
-        np.fill_diagonal(corr_matrix, 1.0)
-        
-        self.corr_matrix = corr_matrix
-        self.cholesky = np.linalg.cholesky(corr_matrix)
+            self.corr_matrix = None
+            self.cholesky = None
+        else:
+            self.bayes_net = None
+            self._fit_dense_copula(normal_df)
         
         # Fit target model
         if self.target_col and self.target_col in self.columns:
@@ -119,11 +125,39 @@ class MISATASynthesizer:
             
             self.target_model.fit(df[feature_cols], df[self.target_col])
             self.feature_cols = feature_cols
+            if self.compile_target_model:
+                self.compiled_target_model = CompiledTreeEnsemble.from_sklearn(self.target_model)
             self.target_rate = df[self.target_col].mean() if self.task == 'classification' else None
         
         self._fitted = True
         return self
     
+    def _fit_dense_copula(self, normal_df: pd.DataFrame) -> None:
+        """Estimate the dense (optionally PCA-reduced) correlation matrix and its Cholesky factor."""
+        # PCA for high-dimensional
+        if self.use_pca:
+            self.pca = PCA(n_components=self.pca_components, random_state=self.random_state)
+            normal_reduced = self.pca.fit_transform(normal_df.values)
+            corr_matrix = np.corrcoef(normal_reduced.T)
+            self.pca_fitted = True
+        else:
+            corr_matrix = normal_df.corr().values
+            self.pca_fitted = False
+        
+        # Clean correlation matrix
+        corr_matrix = np.nan_to_num(corr_matrix, nan=0.0)
+        np.fill_diagonal(corr_matrix, 1.0)
+        
+        # Ensure positive definite
+        eigvals, eigvecs = np.linalg.eigh(corr_matrix)
+        eigvals = np.maximum(eigvals, 1e-6)
+        corr_matrix = eigvecs @ np.diag(eigvals) @ eigvecs.T
+        corr_matrix = (corr_matrix + corr_matrix.T) / 2
+        np.fill_diagonal(corr_matrix, 1.0)
+        
+        self.corr_matrix = corr_matrix
+        self.cholesky = np.linalg.cholesky(corr_matrix)
+    
     def intervene(self, variable: str, value: float) -> 'MISATASynthesizer':
         """
         Set an intervention: do(variable=value).
@@ -143,23 +177,124 @@ class MISATASynthesizer:
         self._intervention = None
         return self
     
-    def sample(self, n_samples: int, seed: Optional[int] = None) -> pd.DataFrame:
+    def sample(
+        self,
+        n_samples: int,
+        seed: Optional[int] = None,
+        output: str = 'pandas'
+    ) -> Union[pd.DataFrame, np.ndarray, 'pyarrow.Table']:  # noqa: F821
         """
         Generate synthetic samples.
         
         Args:
             n_samples: Number of samples to generate
             seed: Random seed (uses self.random_state if None)
+            output: 'pandas' (DataFrame), 'numpy' (structured array) or
+                'arrow' (pyarrow.Table sharing memory with the generated columns)
         """
         if not self._fitted:
             raise RuntimeError("Must call fit() before sample()")
+        check_output(output)
+        
+        if seed is None:
+            seed = self.random_state
+        rng = np.random.default_rng(seed)
+        
+        return to_output(self._sample_columns(n_samples, rng), self.columns, output)
+    
+    def sample_to_parquet(
+        self,
+        path: str,
+        n_samples: int,
+        row_group_size: int = 100_000,
+        seed: Optional[int] = None
+    ) -> None:
+        """
+        Stream synthetic samples to a Parquet file, one row group at a time.
+        
+        Columns go straight from NumPy to Arrow, skipping pandas, and only one
+        row group is held in memory. The file holds the same rows as
+        sample(n_samples, seed): for classification, a first pass keeps the
+        target probabilities (8 bytes per row) to compute the global
+        target-rate threshold, then the features of each row group are
+        regenerated and labelled from the kept probabilities, so the target
+        model runs once per row.
+        
+        Args:
+            path: Output file path
+            n_samples: Total number of samples to generate
+            row_group_size: Rows generated and written per row group
+            seed: Random seed (uses self.random_state if None)
+        """
+        if not self._fitted:
+            raise RuntimeError("Must call fit() before sample_to_parquet()")
+        if n_samples <= 0:
+            raise ValueError("n_samples must be positive")
+        if row_group_size <= 0:
+            raise ValueError("row_group_size must be positive")
+        require_pyarrow()
+        import pyarrow.parquet as pq
         
         if seed is None:
             seed = self.random_state
+        group_sizes = [
+            min(row_group_size, n_samples - start)
+            for start in range(0, n_samples, row_group_size)
+        ]
+        
+        probs = None
+        threshold = None
+        if self.target_col in self.columns and self.task == 'classification':
+            # Target generation draws nothing from rng, so a fresh generator
+            # with the same seed reproduces the same features below
+            rng = np.random.default_rng(seed)
+            probs = np.concatenate([
+                self._predict_target(self._sample_columns(size, rng, with_target=False))
+                for size in group_sizes
+            ])
+            threshold = np.percentile(probs, (1 - self.target_rate) * 100)
+        
         rng = np.random.default_rng(seed)
+        writer = None
+        try:
+            start = 0
+            for size in group_sizes:
+                group_probs = probs[start:start + size] if probs is not None else None
+                columns = self._sample_columns(size, rng, threshold=threshold, probs=group_probs)
+                start += size
+                table = to_arrow(columns, self.columns)
+                if writer is None:
+                    writer = pq.ParquetWriter(path, table.schema)
+                writer.write_table(table, row_group_size=size)
+        finally:
+            if writer is not None:
+                writer.close()
+    
+    def _sample_columns(
+        self,
+        n_samples: int,
+        rng: np.random.Generator,
+        with_target: bool = True,
+        threshold: Optional[float] = None,
+        probs: Optional[np.ndarray] = None
+    ) -> Dict[str, np.ndarray]:
+        """
+        Generate one array per column, drawing from rng.
         
+        Args:
+            n_samples: Number of rows
+            rng: Random generator (only features draw from it)
+            with_target: Also generate the target column
+            threshold: Classification probability threshold; computed from
+                this batch's target rate if None
+            probs: Precomputed P(target=1) for these rows; the target model
+                is only run if None
+        """
         # Sample correlated values
-        if self.pca_fitted:
+        if self.bayes_net is not None:
+            z = rng.standard_normal((n_samples, len(self.columns)))
+            uniform = stats.norm.cdf(self.bayes_net.sample_normal(z))
+        elif self.pca_fitted:
             n_components = self.cholesky.shape[0]
             z = rng.standard_normal((n_samples, n_components))
             correlated = z @ self.cholesky.T
@@ -187,17 +322,32 @@ class MISATASynthesizer:
                 synthetic_data[col] = np.interp(uniform[:, i], positions, sorted_vals)
         
         # Generate target
-        if self.target_col and self.target_col in self.columns:
-            X_synth = pd.DataFrame({c: synthetic_data[c] for c in self.feature_cols})
-            
+        if with_target and self.target_col and self.target_col in self.columns:
             if self.task == 'classification':
-                probs = self.target_model.predict_proba(X_synth)[:, 1]
-                threshold = np.percentile(probs, (1 - self.target_rate) * 100)
+                if probs is None:
+                    probs = self._predict_target(synthetic_data)
+                if threshold is None:
+                    threshold = np.percentile(probs, (1 - self.target_rate) * 100)
                 synthetic_data[self.target_col] = (probs >= threshold).astype(int)
             else:
-                synthetic_data[self.target_col] = self.target_model.predict(X_synth)
+                synthetic_data[self.target_col] = self._predict_target(synthetic_data)
+        
+        return synthetic_data
+    
+    def _predict_target(self, features: Dict[str, np.ndarray]) -> np.ndarray:
+        """P(target=1) for classification, predicted values for regression."""
+        n_rows = len(features[self.feature_cols[0]])
+        if (self.compiled_target_model is not None
+                and n_rows <= self.compiled_target_model.max_batch_rows):
+            X = np.column_stack([features[c] for c in self.feature_cols])
+            if self.task == 'classification':
+                return self.compiled_target_model.predict_proba(X)[:, 1]
+            return self.compiled_target_model.predict(X)
         
-        return pd.DataFrame(synthetic_data)[self.columns]
+        X_synth = pd.DataFrame({c: features[c] for c in self.feature_cols})
+        if self.task == 'classification':
+            return self.target_model.predict_proba(X_synth)[:, 1]
+        return self.target_model.predict(X_synth)
     
     def get_feature_importance(self) -> Dict[str, float]:
         """Get feature importance for target prediction."""
@@ -12,7 +12,10 @@ import numpy as np
 import pandas as pd
 from scipy import stats
 from sklearn.ensemble import GradientBoostingClassifier, GradientBoostingRegressor
-from typing import Optional, Dict, Tuple
+from typing import Optional, Dict, Tuple, Union
+
+from misata.compiled_trees import CompiledTreeEnsemble
+from misata.output import check_output, to_output
 
 
 class ConditionalInterventionSynthesizer:
@@ -32,11 +35,14 @@ class ConditionalInterventionSynthesizer:
         self,
         target_col: str,
         task: str = 'classification',
-        random_state: int = 42
+        random_state: int = 42,
+        compile_target_model: bool = False
     ):
         self.target_col = target_col
         self.task = task
         self.random_state = random_state
+        self.compile_target_model = compile_target_model
+        self.compiled_target_model = None
         self._fitted = False
         
     def fit(self, df: pd.DataFrame) -> 'ConditionalInterventionSynthesizer':
@@ -93,6 +99,11 @@ class ConditionalInterventionSynthesizer:
         
         self.target_model.fit(df[feature_cols], df[self.target_col])
         self.feature_cols = feature_cols
+        if self.compile_target_model:
+            # Per-individual predictions are single-row; the compiled
+            # ensemble avoids sklearn's per-call DataFrame validation
+            self.compiled_target_model = CompiledTreeEnsemble.from_sklearn(self.target_model)
+            self.original_features = df[feature_cols].to_numpy()
         self.target_rate = df[self.target_col].mean() if self.task == 'classification' else None
         
         self._fitted = True
@@ -140,14 +151,19 @@ class ConditionalInterventionSynthesizer:
                 cf_values[col] = np.interp(u, positions, sorted_vals)
         
         # Compute counterfactual target
-        X_cf = pd.DataFrame([{c: cf_values[c] for c in self.feature_cols}])
+        if self.compiled_target_model is not None:
+            X_cf = np.array([[cf_values[c] for c in self.feature_cols]])
+            X_original = self.original_features[[individual_idx]]
+            model = self.compiled_target_model
+        else:
+            X_cf = pd.DataFrame([{c: cf_values[c] for c in self.feature_cols}])
+            X_original = self.original_data[self.feature_cols].iloc[[individual_idx]]
+            model = self.target_model
         
         if self.task == 'classification':
-            prob = self.target_model.predict_proba(X_cf)[0, 1]
+            prob = model.predict_proba(X_cf)[0, 1]
             # Use individual's noise to determine threshold
-            original_prob = self.target_model.predict_proba(
-                self.original_data[self.feature_cols].iloc[[individual_idx]]
-            )[0, 1]
+            original_prob = model.predict_proba(X_original)[0, 1]
             original_outcome = self.original_data[self.target_col].iloc[individual_idx]
             
             # If original was positive and prob was high, counterfactual follows same logic
@@ -156,7 +172,7 @@ class ConditionalInterventionSynthesizer:
             else:
                 cf_values[self.target_col] = 1 if prob >= original_prob * 1.2 else 0
         else:
-            cf_values[self.target_col] = self.target_model.predict(X_cf)[0]
+            cf_values[self.target_col] = model.predict(X_cf)[0]
         
         return pd.Series(cf_values)[self.columns]
     
@@ -212,8 +228,14 @@ class ConditionalInterventionSynthesizer:
         
         return ate, se
     
-    def sample(self, n_samples: int, seed: Optional[int] = None) -> pd.DataFrame:
-        """Generate synthetic samples (same as base synthesizer)."""
+    def sample(
+        self,
+        n_samples: int,
+        seed: Optional[int] = None,
+        output: str = 'pandas'
+    ) -> Union[pd.DataFrame, np.ndarray, 'pyarrow.Table']:  # noqa: F821
+        """Generate synthetic samples (same as base synthesizer, including output formats)."""
+        check_output(output)
         if seed is None:
             seed = self.random_state
         rng = np.random.default_rng(seed)
@@ -231,12 +253,18 @@ class ConditionalInterventionSynthesizer:
             synthetic_data[col] = np.interp(uniform[:, i], positions, sorted_vals)
         
         if self.target_col in self.columns:
-            X_synth = pd.DataFrame({c: synthetic_data[c] for c in self.feature_cols})
+            if (self.compiled_target_model is not None
+                    and n_samples <= self.compiled_target_model.max_batch_rows):
+                X_synth = np.column_stack([synthetic_data[c] for c in self.feature_cols])
+                model = self.compiled_target_model
+            else:
+                X_synth = pd.DataFrame({c: synthetic_data[c] for c in self.feature_cols})
+                model = self.target_model
             if self.task == 'classification':
-                probs = self.target_model.predict_proba(X_synth)[:, 1]
+                probs = model.predict_proba(X_synth)[:, 1]
                 threshold = np.percentile(probs, (1 - self.target_rate) * 100)
                 synthetic_data[self.target_col] = (probs >= threshold).astype(int)
             else:
-                synthetic_data[self.target_col] = self.target_model.predict(X_synth)
+                synthetic_data[self.target_col] = model.predict(X_synth)
         
-        return pd.DataFrame(synthetic_data)[self.columns]
+        return to_output(synthetic_data, self.columns, output)
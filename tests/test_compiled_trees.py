@@ -0,0 +1,100 @@
+"""Tests for CompiledTreeEnsemble against sklearn's gradient boosting."""
+
+import numpy as np
+import pandas as pd
+import pytest
+from sklearn.ensemble import GradientBoostingClassifier, GradientBoostingRegressor
+
+from misata import ConditionalInterventionSynthesizer, MISATASynthesizer
+from misata.compiled_trees import CompiledTreeEnsemble
+
+
+@pytest.fixture(scope='module')
+def data():
+    rng = np.random.default_rng(0)
+    X = rng.standard_normal((2000, 6))
+    y = (X[:, 0] - 0.5 * X[:, 1] ** 2 + rng.standard_normal(2000) > 0).astype(int)
+    X_test = rng.standard_normal((1025, 6)) * 2
+    return X, y, X_test
+
+
+@pytest.fixture(scope='module')
+def classifier(data):
+    X, y, _ = data
+    return GradientBoostingClassifier(n_estimators=100, max_depth=5, random_state=0).fit(X, y)
+
+
+@pytest.fixture(scope='module')
+def regressor(data):
+    X, y, _ = data
+    return GradientBoostingRegressor(n_estimators=100, max_depth=5, random_state=0).fit(X, y + X[:, 2])
+
+
+@pytest.mark.parametrize('n', [1, 1024, 1025])
+def test_classifier_bit_identical(classifier, data, n):
+    X_test = data[2][:n]
+    compiled = CompiledTreeEnsemble.from_sklearn(classifier)
+
+    np.testing.assert_array_equal(compiled.predict_proba(X_test), classifier.predict_proba(X_test))
+    np.testing.assert_array_equal(compiled.predict(X_test), classifier.predict(X_test))
+
+
+@pytest.mark.parametrize('n', [1, 1024, 1025])
+def test_regressor_bit_identical(regressor, data, n):
+    X_test = data[2][:n]
+    compiled = CompiledTreeEnsemble.from_sklearn(regressor)
+
+    np.testing.assert_array_equal(compiled.predict(X_test), regressor.predict(X_test))
+
+
+@pytest.mark.parametrize('bad', [np.nan, np.inf, 1e300])
+def test_non_finite_input_raises(classifier, data, bad):
+    X_test = data[2][:3].copy()
+    X_test[1, 2] = bad
+    compiled = CompiledTreeEnsemble.from_sklearn(classifier)
+
+    with pytest.raises(ValueError):
+        compiled.predict_proba(X_test)
+    with pytest.raises(ValueError):
+        classifier.predict_proba(X_test)
+
+
+def test_wrong_feature_count_raises(classifier):
+    compiled = CompiledTreeEnsemble.from_sklearn(classifier)
+    with pytest.raises(ValueError):
+        compiled.predict_proba(np.zeros((2, 5)))
+
+
+def test_synthesizer_sample_unchanged_by_compilation():
+    rng = np.random.default_rng(1)
+    df = pd.DataFrame({'age': rng.integers(18, 80, 1000), 'hours': rng.normal(40, 8, 1000)})
+    df['income'] = (df['hours'] + rng.normal(0, 5, 1000) > 40).astype(int)
+
+    plain = MISATASynthesizer(target_col='income').fit(df)
+    compiled = MISATASynthesizer(target_col='income', compile_target_model=True).fit(df)
+
+    for n in (10, 2000):
+        pd.testing.assert_frame_equal(plain.sample(n), compiled.sample(n))
+
+
+@pytest.mark.parametrize('task', ['classification', 'regression'])
+def test_intervention_synthesizer_unchanged_by_compilation(task):
+    rng = np.random.default_rng(2)
+    df = pd.DataFrame({'age': rng.integers(18, 80, 300), 'hours': rng.normal(40, 8, 300)})
+    outcome = df['hours'] + 0.2 * df['age'] + rng.normal(0, 5, 300)
+    df['income'] = (outcome > outcome.median()).astype(int) if task == 'classification' else outcome
+
+    plain = ConditionalInterventionSynthesizer(target_col='income', task=task).fit(df)
+    compiled = ConditionalInterventionSynthesizer(
+        target_col='income', task=task, compile_target_model=True
+    ).fit(df)
+
+    indices = list(range(0, 300, 7))
+    pd.testing.assert_frame_equal(
+        plain.intervention_batch(indices, {'hours': 50.0}),
+        compiled.intervention_batch(indices, {'hours': 50.0})
+    )
+    assert plain.average_treatment_effect('hours', 50.0, 30.0) == \
+        compiled.average_treatment_effect('hours', 50.0, 30.0)
+    for n in (10, 2000):
+        pd.testing.assert_frame_equal(plain.sample(n), compiled.sample(n))
@@ -0,0 +1,141 @@
+"""Tests for the DAG-restricted Gaussian copula."""
+
+import time
+
+import numpy as np
+import pandas as pd
+import pytest
+from scipy import stats
+
+from misata import MISATASynthesizer
+from misata.graph_copula import GaussianBayesNet, parse_graph, topological_order
+
+COLUMNS = ['a', 'b', 'c', 'd']
+
+
+def test_parse_graph_dict():
+    parents = parse_graph({'c': ['a', 'b'], 'b': ['a']}, COLUMNS)
+    assert parents == [[], [0], [0, 1], []]
+
+
+def test_parse_graph_directed_mask():
+    mask = np.zeros((4, 4), dtype=bool)
+    mask[0, 2] = mask[1, 2] = mask[3, 1] = True
+    assert parse_graph(mask, COLUMNS) == [[], [3], [0, 1], []]
+
+
+def test_parse_graph_symmetric_mask_is_oriented_by_column_order():
+    mask = np.zeros((4, 4), dtype=bool)
+    mask[0, 2] = mask[2, 0] = True
+    mask[1, 3] = mask[3, 1] = True
+    assert parse_graph(mask, COLUMNS) == [[], [], [0], [1]]
+
+
+@pytest.mark.parametrize('graph', [
+    {'e': ['a']},
+    {'a': ['e']},
+    {'a': ['a']},
+    np.diag([True, False, False, False]),
+    np.zeros((3, 3), dtype=bool),
+])
+def test_parse_graph_rejects_invalid(graph):
+    with pytest.raises(ValueError):
+        parse_graph(graph, COLUMNS)
+
+
+def test_topological_order_puts_parents_first():
+    parents = [[2], [], [1], [0, 2]]
+    order = list(topological_order(parents))
+    for child, child_parents in enumerate(parents):
+        for p in child_parents:
+            assert order.index(p) < order.index(child)
+
+
+def test_topological_order_detects_cycle():
+    with pytest.raises(ValueError, match='cycle'):
+        topological_order([[2], [0], [1]])
+
+
+def test_synthesizer_rejects_cyclic_graph():
+    df = pd.DataFrame(np.random.default_rng(0).normal(size=(100, 2)), columns=['a', 'b'])
+    with pytest.raises(ValueError):
+        MISATASynthesizer(causal_graph={'a': ['b'], 'b': ['a']}).fit(df)
+
+
+@pytest.fixture(scope='module')
+def chain_net():
+    rng = np.random.default_rng(0)
+    n = 5000
+    a = rng.normal(size=n)
+    b = 0.8 * a + 0.6 * rng.normal(size=n)
+    c = 0.5 * b + rng.normal(size=n)
+    d = 0.7 * a - 0.4 * c + rng.normal(size=n)
+    z = np.column_stack([a, b, c, d])
+    return GaussianBayesNet([[], [0], [1], [0, 2]]).fit(z)
+
+
+def test_model_variance_is_unit(chain_net):
+    covariance = np.linalg.inv(chain_net.precision_matrix.toarray())
+    # Rescaling uses simulated scores, so unit variance holds up to simulation error
+    np.testing.assert_allclose(np.diag(covariance), 1.0, atol=0.02)
+
+
+def test_sampled_covariance_matches_precision_along_edges(chain_net):
+    covariance = np.linalg.inv(chain_net.precision_matrix.toarray())
+    noise = np.random.default_rng(1).standard_normal((200_000, 4))
+    sampled = np.cov(chain_net.sample_normal(noise).T)
+
+    for child, child_parents in enumerate(chain_net.parents):
+        for p in child_parents:
+            assert sampled[child, p] == pytest.approx(covariance[child, p], abs=0.01)
+    np.testing.assert_allclose(np.diag(sampled), 1.0, atol=0.01)
+
+
+def test_precision_is_sparse_for_chain():
+    rng = np.random.default_rng(0)
+    d = 50
+    z = np.cumsum(rng.normal(size=(1000, d)), axis=1)
+    net = GaussianBayesNet([[]] + [[i - 1] for i in range(1, d)]).fit(z)
+    # Tridiagonal: d diagonal entries plus two per edge
+    assert net.precision_matrix.nnz == d + 2 * (d - 1)
+
+
+def test_unconnected_correlated_coparents_keep_child_marginal():
+    rng = np.random.default_rng(0)
+    n = 5000
+    a = rng.normal(size=n)
+    b = 0.95 * a + np.sqrt(1 - 0.95 ** 2) * rng.normal(size=n)
+    c = a + b + 0.3 * rng.normal(size=n)
+    df = pd.DataFrame({'a': a, 'b': b, 'c': c})
+
+    synth = MISATASynthesizer(causal_graph={'c': ['a', 'b']}).fit(df)
+    latent = synth.bayes_net.sample_normal(rng.standard_normal((50_000, 3)))
+    synthetic = synth.sample(20_000)
+
+    assert latent[:, 2].std() == pytest.approx(1.0, abs=0.02)
+    assert stats.ks_2samp(synthetic['c'], df['c']).statistic < 0.02
+
+
+def random_sparse_net(d, rng):
+    parents = [sorted(set(rng.choice(j, min(j, 4), replace=False).tolist())) for j in range(d)]
+    z = rng.standard_normal((500, d))
+    for j in range(d):
+        if parents[j]:
+            z[:, j] += 0.5 * z[:, parents[j]].sum(axis=1)
+    return GaussianBayesNet(parents), z
+
+
+def test_fit_time_grows_linearly_on_sparse_graph():
+    rng = np.random.default_rng(0)
+    timings = []
+    for d in (200, 1600):
+        net, z = random_sparse_net(d, rng)
+        best = np.inf
+        for _ in range(3):
+            start = time.perf_counter()
+            net.fit(z)
+            best = min(best, time.perf_counter() - start)
+        timings.append(best)
+
+    # 8x the variables and edges: linear is ~8x, pairwise covariances ~64x
+    assert timings[1] / timings[0] < 20
@@ -0,0 +1,69 @@
+"""Tests for sample() output formats and sample_to_parquet."""
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from misata import MISATASynthesizer
+
+pq = pytest.importorskip('pyarrow.parquet')
+
+
+@pytest.fixture(scope='module')
+def synth():
+    rng = np.random.default_rng(0)
+    df = pd.DataFrame({
+        'age': rng.integers(18, 80, 1000),
+        'hours': rng.normal(40, 8, 1000),
+    })
+    df['income'] = (df['hours'] + rng.normal(0, 5, 1000) > 45).astype(int)
+    return MISATASynthesizer(target_col='income').fit(df)
+
+
+def test_output_formats_match_pandas(synth):
+    expected = synth.sample(500)
+
+    records = synth.sample(500, output='numpy')
+    table = synth.sample(500, output='arrow')
+
+    assert list(records.dtype.names) == list(expected.columns)
+    pd.testing.assert_frame_equal(pd.DataFrame(records), expected)
+    pd.testing.assert_frame_equal(table.to_pandas(), expected)
+
+
+def test_unknown_output_raises(synth):
+    with pytest.raises(ValueError):
+        synth.sample(10, output='csv')
+
+
+@pytest.mark.parametrize('n_samples,row_group_size', [(2500, 1000), (2001, 1000), (7, 100)])
+def test_parquet_matches_sample(synth, tmp_path, n_samples, row_group_size):
+    path = tmp_path / 'out.parquet'
+
+    synth.sample_to_parquet(path, n_samples, row_group_size=row_group_size)
+
+    metadata = pq.ParquetFile(path).metadata
+    assert metadata.num_rows == n_samples
+    assert metadata.num_row_groups == -(-n_samples // row_group_size)
+    # One leftover row must not be forced to the positive class
+    pd.testing.assert_frame_equal(pq.read_table(path).to_pandas(), synth.sample(n_samples))
+
+
+def test_parquet_rejects_empty_export(synth, tmp_path):
+    with pytest.raises(ValueError):
+        synth.sample_to_parquet(tmp_path / 'out.parquet', 0)
+
+
+def test_parquet_runs_target_model_once_per_row(synth, tmp_path, monkeypatch):
+    predicted_rows = []
+    predict = synth._predict_target
+
+    def counting_predict(features):
+        probs = predict(features)
+        predicted_rows.append(len(probs))
+        return probs
+
+    monkeypatch.setattr(synth, '_predict_target', counting_predict)
+    synth.sample_to_parquet(tmp_path / 'out.parquet', 2500, row_group_size=1000)
+
+    assert sum(predicted_rows) == 2500
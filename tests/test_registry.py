@@ -0,0 +1,171 @@
+"""Tests for SynthesizerRegistry and estimate_nbytes."""
+
+import pickle
+import threading
+import time
+
+import numpy as np
+import pytest
+from sklearn.ensemble import GradientBoostingClassifier
+
+from misata.registry import SynthesizerRegistry, estimate_nbytes
+
+KB = 1024
+
+
+def make_model(n_bytes):
+    return {'weights': np.zeros(n_bytes // 8)}
+
+
+@pytest.fixture
+def registry(tmp_path):
+    reg = SynthesizerRegistry(tmp_path, max_bytes=250 * KB)
+    for name in 'abc':
+        reg.save(name, make_model(100 * KB))
+    return reg
+
+
+def test_lru_order_evicts_least_recently_used(registry):
+    registry.get('a')
+    registry.get('b')
+    registry.get('a')
+    registry.get('c')
+
+    assert registry.resident() == ['a', 'c']
+    assert registry.stats()['evictions'] == 1
+
+
+def test_resident_total_stays_within_budget(registry):
+    for name in 'abcabcbca':
+        registry.get(name)
+        assert registry.current_bytes <= registry.max_bytes
+    assert registry.current_bytes == sum(registry.nbytes(n) for n in registry.resident())
+
+
+def test_oversized_model_is_returned_without_flushing_cache(tmp_path):
+    reg = SynthesizerRegistry(tmp_path, max_bytes=3000 * KB)
+    for name in 'abc':
+        reg.save(name, make_model(800 * KB))
+        reg.get(name)
+    reg.save('big', make_model(8000 * KB))
+
+    model = reg.get('big')
+
+    assert model['weights'].nbytes == 8000 * KB
+    assert reg.resident() == ['a', 'b', 'c']
+    assert reg.stats()['evictions'] == 0
+
+
+def test_stats_counters(registry):
+    registry.get('a')
+    registry.get('a')
+    registry.get('b')
+
+    stats = registry.stats()
+    assert stats['hits'] == 1
+    assert stats['misses'] == 2
+    assert stats['coalesced'] == 0
+    assert stats['resident_models'] == 2
+
+
+def test_manual_drops_count_as_invalidations(registry):
+    registry.get('a')
+    registry.get('b')
+
+    registry.evict('a')
+    registry.save('b', make_model(100 * KB))
+    registry.get('c')
+    registry.clear()
+
+    stats = registry.stats()
+    assert stats['evictions'] == 0
+    assert stats['invalidations'] == 3
+
+
+def test_concurrent_gets_trigger_single_load(tmp_path):
+    calls = []
+
+    def slow_loader(path):
+        calls.append(path)
+        time.sleep(0.1)
+        with open(path, 'rb') as f:
+            return pickle.load(f)
+
+    reg = SynthesizerRegistry(tmp_path, max_bytes=1000 * KB, loader=slow_loader)
+    reg.save('m', make_model(100 * KB))
+
+    results = []
+    barrier = threading.Barrier(8)
+
+    def worker():
+        barrier.wait()
+        results.append(reg.get('m'))
+
+    threads = [threading.Thread(target=worker) for _ in range(8)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+
+    assert len(calls) == 1
+    assert all(r is results[0] for r in results)
+    stats = reg.stats()
+    assert stats['misses'] == 1
+    assert stats['coalesced'] == 7
+    assert stats['hits'] == 0
+
+
+def test_save_during_load_does_not_cache_stale_model(tmp_path):
+    file_read = threading.Event()
+    release = threading.Event()
+
+    def blocking_loader(path):
+        with open(path, 'rb') as f:
+            model = pickle.load(f)
+        file_read.set()
+        release.wait()
+        return model
+
+    reg = SynthesizerRegistry(tmp_path, max_bytes=1000 * KB, loader=blocking_loader)
+    reg.save('m', {'version': 1})
+
+    results = []
+    loader_thread = threading.Thread(target=lambda: results.append(reg.get('m')))
+    loader_thread.start()
+    file_read.wait()
+    reg.save('m', {'version': 2})
+    release.set()
+    loader_thread.join()
+
+    assert results[0]['version'] == 1
+    assert 'm' not in reg
+    assert reg.get('m')['version'] == 2
+
+
+def test_missing_model_raises(registry):
+    with pytest.raises(FileNotFoundError):
+        registry.get('missing')
+    # A failed load leaves no pending state behind
+    with pytest.raises(FileNotFoundError):
+        registry.get('missing')
+
+
+def test_estimate_nbytes_counts_gbm_tree_buffers():
+    rng = np.random.default_rng(0)
+    X = rng.standard_normal((500, 5))
+    y = (X[:, 0] + rng.standard_normal(500) > 0).astype(int)
+    model = GradientBoostingClassifier(n_estimators=100, max_depth=5, random_state=0).fit(X, y)
+
+    tree_bytes = 0
+    for estimator in model.estimators_[:, 0]:
+        state = estimator.tree_.__getstate__()
+        tree_bytes += state['nodes'].nbytes + state['values'].nbytes
+
+    assert tree_bytes <= estimate_nbytes(model) < 2 * tree_bytes
+    assert estimate_nbytes(pickle.loads(pickle.dumps(model))) >= tree_bytes
+
+
+def test_estimate_nbytes_counts_shared_buffer_once():
+    base = np.zeros(10_000)
+    single = estimate_nbytes([base])
+    assert estimate_nbytes([base, base[:5000], base[::2]]) < single + 1000